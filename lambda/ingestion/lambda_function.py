@@ -4,164 +4,102 @@ import os
 import uuid
 import re
 from datetime import datetime, UTC
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 
 sqs = boto3.client('sqs')
 QUEUE_URL = os.environ.get('SQS_QUEUE_URL')
 
+# Resolve credentials and open the TLS connection during init rather than
+# on the first request; a failure here just leaves that to the first send
+if QUEUE_URL:
+    try:
+        sqs.get_queue_attributes(QueueUrl=QUEUE_URL, AttributeNames=['QueueArn'])
+    except Exception as e:
+        print(f"SQS warm-up skipped: {str(e)}")
+
 MAX_CHAR_LIMIT = 17000
 MAX_TENANT_ID_LENGTH = 100
 MAX_LOG_ID_LENGTH = 100
-TENANT_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
+# Used with fullmatch: '$' would also accept a trailing newline
+TENANT_ID_PATTERN = re.compile(r'[a-zA-Z0-9_-]+')
+
+# A JSON array body is ingested as a batch of log objects
+MAX_BATCH_SIZE = 10
+
+# Largest JSON body that could still pass validation: a log object where every
+# text character is an escaped surrogate pair (12 chars), plus room for the
+# other fields; a batch may hold MAX_BATCH_SIZE of them. Anything longer is
+# rejected before parsing.
+MAX_JSON_OBJECT_CHARS = MAX_CHAR_LIMIT * 12 + 4096
+MAX_JSON_BATCH_CHARS = MAX_BATCH_SIZE * MAX_JSON_OBJECT_CHARS
+
+# JSON insignificant whitespace, skipped to find the body's first character
+JSON_LEADING_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# SendMessageBatch limits: 10 entries and 256 KiB of payload per call
+SQS_BATCH_MAX_ENTRIES = 10
+SQS_BATCH_MAX_BYTES = 256 * 1024
+
+# Shared compact encoder for SQS message bodies; the worker only parses them
+MESSAGE_ENCODER = json.JSONEncoder(separators=(',', ':'))
 
 def lambda_handler(event, context):
     """
     Ingestion endpoint handler.
     Accepts both JSON and plain text formats, normalizes them, and queues for processing.
+    A JSON array of log objects is validated as a whole and queued with SendMessageBatch.
     """
-    
+
     try:
-        headers = event.get('headers', {})
-        headers_lower = {k.lower(): v for k, v in headers.items()}
-        content_type = headers_lower.get('content-type', '')
+        # API Gateway sends null rather than {} when there are no headers
+        headers = event.get('headers') or {}
+        content_type = get_header(headers, 'content-type') or ''
         body = event.get('body', '')
-        
+
         # Handle JSON payload
         if 'application/json' in content_type:
+            max_body_chars = json_body_limit(body)
+            if len(body) > max_body_chars:
+                print(f"Request rejected: body length {len(body)} exceeds limit {max_body_chars}")
+                return error_response(413, f'Payload exceeds maximum allowed size ({max_body_chars} characters)')
+
             try:
                 data = json.loads(body)
 
+                if isinstance(data, list):
+                    return handle_batch(data)
+
                 if not isinstance(data, dict):
-                    return {
-                        'statusCode': 400,
-                        'headers': {'Content-Type': 'application/json'},
-                        'body': json.dumps({
-                            'error': 'Invalid JSON structure',
-                            'detail': 'Expected JSON object, not array'
-                        })
-                    }
+                    return error_response(400, 'Invalid JSON structure', 'Expected JSON object or array of objects')
 
                 tenant_id = data.get('tenant_id')
-                log_id = data.get('log_id', str(uuid.uuid4()))
+                # A null log_id is treated as missing; other non-strings fail validation
+                log_id = data.get('log_id')
+                if log_id is None:
+                    log_id = str(uuid.uuid4())
                 text = data.get('text')
                 source = 'json'
             except json.JSONDecodeError:
-                return {
-                    'statusCode': 400,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({'error': 'Invalid JSON'})
-                }
-        
+                return error_response(400, 'Invalid JSON')
+
         # Handle plain text payload
         elif 'text/plain' in content_type:
-            tenant_id = headers_lower.get('x-tenant-id')
-            log_id = headers_lower.get('x-log-id')
+            tenant_id = get_header(headers, 'x-tenant-id')
+            log_id = get_header(headers, 'x-log-id')
 
             if not log_id:
-                log_id = str(uuid.uuid4())  
+                log_id = str(uuid.uuid4())
 
             text = body
             source = 'text'
-        
+
         else:
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'error': 'Unsupported Content-Type'})
-            }
-        
-        # Validate required fields
-        if not tenant_id:
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'error': 'Missing required field: tenant_id',
-                    'detail': 'tenant_id is required'
-                })
-            }
+            return error_response(400, 'Unsupported Content-Type')
 
-        if not text:
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'error': 'Missing required field: text',
-                    'detail': 'text is required'
-                })
-            }
-        
-        if not isinstance(tenant_id, str):
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'error': 'Validation failed',
-                    'detail': 'tenant_id must be a string'
-                })
-            }
-        
-        if not isinstance(text, str):
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'error': 'Validation failed',
-                    'detail': 'text must be a string'
-                })
-            }
-        
-        if log_id:
-            if not isinstance(log_id, str):
-                return {
-                    'statusCode': 400,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({
-                        'error': 'Validation failed',
-                        'detail': 'log_id must be a string'
-                    })
-                }
-            if len(log_id) > MAX_LOG_ID_LENGTH:
-                print(f"✗ log_id too long: {len(log_id)} chars")
-                return {
-                    'statusCode': 400,
-                    'headers': {'Content-Type': 'application/json'},
-                    'body': json.dumps({
-                        'error': 'Validation failed',
-                        'detail': f'log_id must not exceed {MAX_LOG_ID_LENGTH} characters (got {len(log_id)})'
-                    })
-                }
-        
-        if len(tenant_id) > MAX_TENANT_ID_LENGTH:
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'error': 'Validation failed',
-                    'detail': f'tenant_id exceeds {MAX_TENANT_ID_LENGTH} characters'
-                })
-            }
-        
-        
-        if not TENANT_ID_PATTERN.match(tenant_id):
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'error': 'Validation failed',
-                    'detail': 'tenant_id can only contain letters, numbers, hyphens, and underscores'
-                })
-            }
+        validation_error = validate_log(tenant_id, log_id, text)
+        if validation_error:
+            return error_response(*validation_error)
 
-        
-        if len(text) > MAX_CHAR_LIMIT:
-            print(f"Request rejected: text length {len(text)} exceeds limit {MAX_CHAR_LIMIT}")
-            return {
-                'statusCode': 413, # 413 Payload Too Large
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps({'error': f'Payload text exceeds maximum allowed characters ({MAX_CHAR_LIMIT})'})
-            }
-        
         # Normalize into unified message format
         message = {
             'tenant_id': tenant_id,
@@ -170,12 +108,12 @@ def lambda_handler(event, context):
             'source': source,
             'timestamp': datetime.now(UTC).isoformat()
         }
-        
+
         # Queue message for async processing
         try:
             response = sqs.send_message(
                 QueueUrl=QUEUE_URL,
-                MessageBody=json.dumps(message),
+                MessageBody=MESSAGE_ENCODER.encode(message),
                 MessageAttributes={
                     'tenant_id': {
                         'StringValue': tenant_id,
@@ -202,16 +140,222 @@ def lambda_handler(event, context):
 
         except ClientError as e:
             print(f"SQS Client Error: {e}")
-            return {
-                'statusCode': 503,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps({'error': 'Service Unavailable: Failed to queue message'})
-            }
-    
+            return error_response(503, 'Service Unavailable: Failed to queue message')
+
     except Exception as e:
         print(f"Error: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': 'Internal server error'})
-        }
\ No newline at end of file
+        return error_response(500, 'Internal server error')
+
+
+def handle_batch(entries):
+    """
+    Validate and queue a JSON array of log objects.
+    The whole batch is rejected if any entry is invalid; otherwise entries are
+    sent with SendMessageBatch and SQS-side failures are reported by entry index.
+    """
+
+    if not entries:
+        return error_response(400, 'Invalid JSON structure', 'Expected a non-empty array of log objects')
+
+    if len(entries) > MAX_BATCH_SIZE:
+        return error_response(
+            400,
+            'Validation failed',
+            f'batch must not exceed {MAX_BATCH_SIZE} entries (got {len(entries)})'
+        )
+
+    timestamp = datetime.now(UTC).isoformat()
+    messages = []
+
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            return error_response(400, 'Invalid JSON structure', f'entry {index}: expected JSON object')
+
+        tenant_id = entry.get('tenant_id')
+        log_id = entry.get('log_id')
+        if log_id is None:
+            log_id = str(uuid.uuid4())
+        text = entry.get('text')
+
+        validation_error = validate_log(tenant_id, log_id, text)
+        if validation_error:
+            status_code, error, detail = validation_error
+            return error_response(status_code, error, f'entry {index}: {detail}' if detail else f'entry {index}')
+
+        messages.append({
+            'tenant_id': tenant_id,
+            'log_id': log_id,
+            'text': text,
+            'source': 'json',
+            'timestamp': timestamp
+        })
+
+    failed = send_batch(messages)
+    accepted = [m['log_id'] for i, m in enumerate(messages) if i not in failed]
+    # Reported by entry index: a log_id the client omitted was generated here
+    # and means nothing to the client
+    failed_entries = [{'index': i, 'log_id': messages[i]['log_id']} for i in sorted(failed)]
+
+    if not accepted:
+        return error_response(503, 'Service Unavailable: Failed to queue message')
+
+    return {
+        'statusCode': 207 if failed else 202,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': json.dumps({
+            'message': 'Partially accepted' if failed else 'Accepted',
+            'log_ids': accepted,
+            'failed': failed_entries
+        })
+    }
+
+
+def send_batch(messages):
+    """
+    Queue messages with SendMessageBatch, chunked to the SQS per-call limits.
+    Returns the set of message indexes that SQS did not accept.
+    """
+
+    entries = [
+        {
+            'Id': str(index),
+            'MessageBody': MESSAGE_ENCODER.encode(message),
+            'MessageAttributes': {
+                'tenant_id': {
+                    'StringValue': message['tenant_id'],
+                    'DataType': 'String'
+                }
+            }
+        }
+        for index, message in enumerate(messages)
+    ]
+
+    failed = set()
+
+    for chunk in chunk_entries(entries):
+        try:
+            response = sqs.send_message_batch(QueueUrl=QUEUE_URL, Entries=chunk)
+        except (ClientError, BotoCoreError) as e:
+            # Earlier chunks may already be queued, so fail only this chunk
+            print(f"SQS Client Error: {e}")
+            failed.update(int(entry['Id']) for entry in chunk)
+            continue
+
+        for failure in response.get('Failed', []):
+            print(f"✗ SQS rejected entry {failure['Id']}: {failure.get('Code')}")
+            failed.add(int(failure['Id']))
+
+        print(f"Queued {len(chunk) - len(response.get('Failed', []))} of {len(chunk)} batch messages")
+
+    return failed
+
+
+def chunk_entries(entries):
+    """
+    Split SendMessageBatch entries into groups that respect both the entry
+    count and total payload size limits.
+    """
+
+    chunk = []
+    chunk_bytes = 0
+
+    for entry in entries:
+        # The encoder escapes non-ASCII, so the body length is its byte size
+        tenant_id = entry['MessageAttributes']['tenant_id']['StringValue']
+        size = len(entry['MessageBody']) + len('tenant_id') + len('String') + len(tenant_id)
+
+        if chunk and (len(chunk) == SQS_BATCH_MAX_ENTRIES or chunk_bytes + size > SQS_BATCH_MAX_BYTES):
+            yield chunk
+            chunk = []
+            chunk_bytes = 0
+
+        chunk.append(entry)
+        chunk_bytes += size
+
+    if chunk:
+        yield chunk
+
+
+def validate_log(tenant_id, log_id, text):
+    """
+    Check a normalized log entry against the ingestion rules.
+    Returns (status_code, error, detail) for the first rule that fails, or None.
+    """
+
+    # Validate required fields
+    if not tenant_id:
+        return 400, 'Missing required field: tenant_id', 'tenant_id is required'
+
+    if not text:
+        return 400, 'Missing required field: text', 'text is required'
+
+    if not isinstance(tenant_id, str):
+        return 400, 'Validation failed', 'tenant_id must be a string'
+
+    if not isinstance(text, str):
+        return 400, 'Validation failed', 'text must be a string'
+
+    # Checked by type, not truthiness: 0 or false must not slip through as a log_id
+    if not isinstance(log_id, str):
+        return 400, 'Validation failed', 'log_id must be a string'
+
+    if len(log_id) > MAX_LOG_ID_LENGTH:
+        print(f"✗ log_id too long: {len(log_id)} chars")
+        return 400, 'Validation failed', f'log_id must not exceed {MAX_LOG_ID_LENGTH} characters (got {len(log_id)})'
+
+    if len(tenant_id) > MAX_TENANT_ID_LENGTH:
+        return 400, 'Validation failed', f'tenant_id exceeds {MAX_TENANT_ID_LENGTH} characters'
+
+    if not TENANT_ID_PATTERN.fullmatch(tenant_id):
+        return 400, 'Validation failed', 'tenant_id can only contain letters, numbers, hyphens, and underscores'
+
+    if len(text) > MAX_CHAR_LIMIT:
+        print(f"Request rejected: text length {len(text)} exceeds limit {MAX_CHAR_LIMIT}")
+        # 413 Payload Too Large
+        return 413, f'Payload text exceeds maximum allowed characters ({MAX_CHAR_LIMIT})', None
+
+    return None
+
+
+def json_body_limit(body):
+    """
+    Size limit for a JSON body, chosen by its first non-whitespace character:
+    an array may hold a full batch, anything else at most one log object.
+    """
+
+    start = JSON_LEADING_WHITESPACE.match(body).end()
+    if body[start:start + 1] == '[':
+        return MAX_JSON_BATCH_CHARS
+    return MAX_JSON_OBJECT_CHARS
+
+
+def get_header(headers, name):
+    """
+    Case-insensitive header lookup; name must be lowercase.
+    Scans the headers instead of building a lowercased copy for a few lookups.
+    """
+
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def error_response(status_code, error, detail=None):
+    """
+    Build an API Gateway error response.
+    Every error the endpoint returns goes through here, so all carry the same headers.
+    """
+
+    payload = {'error': error}
+    if detail:
+        payload['detail'] = detail
+
+    return {
+        'statusCode': status_code,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': json.dumps(payload)
+    }
@@ -3,103 +3,86 @@ import boto3
 import os
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, UTC
-from decimal import Decimal
-from botocore.exceptions import ClientError
+from botocore.config import Config
+from botocore.exceptions import ClientError, ParamValidationError
 
-dynamodb = boto3.resource('dynamodb')
+# SQS hands the worker at most 10 records per invocation (batch_size)
+MAX_WORKERS = 10
+
+# Low-level client: skips loading the resource model at cold start.
+# The pool holds one connection per worker thread plus headroom for retries.
+dynamodb = boto3.client('dynamodb', config=Config(max_pool_connections=MAX_WORKERS * 2))
 TABLE_NAME = os.environ.get('DYNAMODB_TABLE')
-table = dynamodb.Table(TABLE_NAME)
+
+# Reused across warm invocations so threads aren't spawned per batch
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+# Resolve credentials and open the TLS connection during init rather than
+# on the first write; a failure here just leaves that to the first put_item
+if TABLE_NAME:
+    try:
+        dynamodb.describe_table(TableName=TABLE_NAME)
+    except Exception as e:
+        print(f"DynamoDB warm-up skipped: {str(e)}")
+
+# The 0.05s/char delay is billed Lambda time, so it only runs when enabled
+SIMULATE_PROCESSING = os.environ.get('SIMULATE_PROCESSING', 'false').lower() == 'true'
+SECONDS_PER_CHAR = 0.05
+
+# One alternation so the text is scanned once; 10-digit phones are listed
+# before 7-digit ones so the longer form wins at the same position.
+# \d stays Unicode-aware so fullwidth and Arabic-Indic digits are redacted too.
+# The email is bounded by ASCII lookarounds instead of \b, so an address written
+# directly against CJK or accented text is still found
+PII_PATTERN = re.compile(
+    r'(?P<phone10>\d{3}-\d{3}-\d{4})'
+    r'|(?P<phone7>\d{3}-\d{4})'
+    r'|(?P<ip>\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'
+    r'|(?P<email>(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}(?![A-Za-z]))'
+)
+PII_REPLACEMENTS = {
+    'phone10': '[REDACTED]',
+    'phone7': '[REDACTED]',
+    'ip': '[IP_REDACTED]',
+    'email': '[EMAIL_REDACTED]'
+}
 
 
 def lambda_handler(event, context):
     """
     Worker handler for processing queued messages.
     Implements idempotency to handle duplicate SQS messages gracefully.
-    Simulates heavy processing and stores results with tenant isolation.
+    Records are processed concurrently so their DynamoDB writes overlap.
+    Records that raise are reported in batchItemFailures so SQS retries only those.
     """
     
-    processed_count = 0
-    skipped_count = 0
-    error_count = 0
+    outcomes = {'processed': 0, 'skipped': 0, 'error': 0}
+    batch_item_failures = []
     
-    for record in event['Records']:
+    # One timestamp per invocation; every record in the batch shares it
+    processed_at = datetime.now(UTC).isoformat()
+    
+    futures = {
+        executor.submit(process_record, record, processed_at): record
+        for record in event['Records']
+    }
+    
+    for future in as_completed(futures):
         try:
-            message = json.loads(record['body'])
-            
-            tenant_id = message['tenant_id']
-            log_id = message['log_id']
-            text = message['text']
-            source = message['source']
-            ingestion_timestamp = message['timestamp']
-            
-            pk = f'TENANT#{tenant_id}'
-            sk = f'LOG#{log_id}'
-            
-            # Simulate processing time: 0.05s per character
-            processing_time = len(text) * 0.05
-            print(f"Processing {log_id} for tenant {tenant_id}, estimated {processing_time:.2f}s")
-            time.sleep(processing_time)
-            
-            # Apply data redaction
-            modified_text = redact_sensitive_data(text)
-            
-            # Store with tenant isolation and idempotent write
-            try:
-                table.put_item(
-                    Item={
-                        'PK': pk,
-                        'SK': sk,
-                        'tenant_id': tenant_id,
-                        'log_id': log_id,
-                        'source': source,
-                        'original_text': text,
-                        'modified_data': modified_text,
-                        'ingested_at': ingestion_timestamp,
-                        'processed_at': datetime.now(UTC).isoformat(),
-                        'text_length': len(text),
-                        'processing_time_sec': Decimal(str(round(processing_time, 2)))
-                    },
-                    # Conditional expression ensures idempotency
-                    ConditionExpression='attribute_not_exists(PK) AND attribute_not_exists(SK)'
-                )
-                
-                print(f"✓ Successfully processed log {log_id} for tenant {tenant_id}")
-                processed_count += 1
-                
-            except ClientError as e:
-                if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
-                    # This is a duplicate message - log already exists
-                    print(f"⊘ Duplicate message detected: log {log_id} for tenant {tenant_id} already processed, skipping")
-                    skipped_count += 1
-                    # Don't raise - continue processing other messages
-                else:
-                    # Other DynamoDB error (throttling, etc.) - re-raise
-                    print(f"✗ DynamoDB error for log {log_id}: {e.response['Error']['Code']}")
-                    error_count += 1
-                    raise
-            
-        except json.JSONDecodeError as e:
-            print(f"✗ Invalid JSON in message body: {str(e)}")
-            error_count += 1
-            # Don't raise - malformed message won't succeed on retry
-            continue
-            
-        except KeyError as e:
-            print(f"✗ Missing required field in message: {str(e)}")
-            error_count += 1
-            # Don't raise - malformed message won't succeed on retry
-            continue
-            
+            outcomes[future.result()] += 1
         except Exception as e:
-            print(f"✗ Unexpected processing error: {str(e)}")
-            error_count += 1
-            raise  # Let SQS handle retry logic for unexpected errors
+            outcomes['error'] += 1
+            # Leave this message on the queue for SQS to retry; the rest are deleted
+            message_id = futures[future]['messageId']
+            print(f"✗ Record {message_id} failed, reporting for retry: {str(e)}")
+            batch_item_failures.append({'itemIdentifier': message_id})
     
     result = {
-        'processed': processed_count,
-        'skipped_duplicates': skipped_count,
-        'errors': error_count,
+        'processed': outcomes['processed'],
+        'skipped_duplicates': outcomes['skipped'],
+        'errors': outcomes['error'],
         'total': len(event['Records'])
     }
     
@@ -107,26 +90,124 @@ def lambda_handler(event, context):
     
     return {
         'statusCode': 200,
-        'body': json.dumps(result)
+        'body': json.dumps(result),
+        'batchItemFailures': batch_item_failures
     }
 
 
+def process_record(record, processed_at):
+    """
+    Process a single SQS record.
+    Simulates heavy processing (when SIMULATE_PROCESSING is enabled) and
+    stores results with tenant isolation.
+    Returns 'processed', 'skipped' or 'error'; raises for errors SQS should retry.
+    """
+    
+    try:
+        message = json.loads(record['body'])
+        
+        if not isinstance(message, dict):
+            print(f"✗ Message body is not a JSON object: {type(message).__name__}")
+            # Don't raise - malformed message won't succeed on retry
+            return 'error'
+        
+        tenant_id = message['tenant_id']
+        log_id = message['log_id']
+        text = message['text']
+        
+        if not isinstance(text, str):
+            print(f"✗ Message text is not a string: {type(text).__name__}")
+            # Don't raise - malformed message won't succeed on retry
+            return 'error'
+        source = message['source']
+        ingestion_timestamp = message['timestamp']
+        
+        pk = f'TENANT#{tenant_id}'
+        sk = f'LOG#{log_id}'
+        
+        print(f"Processing {log_id} for tenant {tenant_id}")
+        
+        # Simulate processing time: 0.05s per character
+        if SIMULATE_PROCESSING:
+            processing_time = len(text) * SECONDS_PER_CHAR
+            time.sleep(processing_time)
+        
+        # Apply data redaction
+        started = time.perf_counter()
+        modified_text = redact_sensitive_data(text)
+        
+        # Without the simulated delay, record how long the real work took
+        if not SIMULATE_PROCESSING:
+            processing_time = time.perf_counter() - started
+        
+        # Store with tenant isolation and idempotent write
+        try:
+            dynamodb.put_item(
+                TableName=TABLE_NAME,
+                # Item is written in AttributeValue form to skip per-call type inference
+                Item={
+                    'PK': {'S': pk},
+                    'SK': {'S': sk},
+                    'tenant_id': {'S': tenant_id},
+                    'log_id': {'S': log_id},
+                    'source': {'S': source},
+                    'original_text': {'S': text},
+                    'modified_data': {'S': modified_text},
+                    'ingested_at': {'S': ingestion_timestamp},
+                    'processed_at': {'S': processed_at},
+                    'text_length': {'N': str(len(text))},
+                    'processing_time_sec': {'N': f'{processing_time:.6f}'}
+                },
+                # Conditional expression ensures idempotency; the condition is
+                # evaluated against the item with this PK+SK, so PK alone suffices
+                ConditionExpression='attribute_not_exists(PK)',
+                # Nothing from the response is used; keep it as small as possible
+                ReturnValues='NONE',
+                ReturnConsumedCapacity='NONE',
+                ReturnItemCollectionMetrics='NONE'
+            )
+            
+            print(f"✓ Successfully processed log {log_id} for tenant {tenant_id}")
+            return 'processed'
+            
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                # This is a duplicate message - log already exists
+                print(f"⊘ Duplicate message detected: log {log_id} for tenant {tenant_id} already processed, skipping")
+                # Don't raise - continue processing other messages
+                return 'skipped'
+            # Other DynamoDB error (throttling, etc.) - re-raise
+            print(f"✗ DynamoDB error for log {log_id}: {e.response['Error']['Code']}")
+            raise
+        
+    except json.JSONDecodeError as e:
+        print(f"✗ Invalid JSON in message body: {str(e)}")
+        # Don't raise - malformed message won't succeed on retry
+        return 'error'
+        
+    except KeyError as e:
+        print(f"✗ Missing required field in message: {str(e)}")
+        # Don't raise - malformed message won't succeed on retry
+        return 'error'
+        
+    except ParamValidationError as e:
+        print(f"✗ Item rejected by DynamoDB parameter validation: {str(e)}")
+        # Don't raise - the same item will fail validation on every retry
+        return 'error'
+        
+    except Exception as e:
+        print(f"✗ Unexpected processing error: {str(e)}")
+        raise  # Let SQS handle retry logic for unexpected errors
+
+
 def redact_sensitive_data(text):
     """
     Remove PII from log text.
-    Redacts phone numbers, IP addresses, and email addresses.
+    Redacts phone numbers, IP addresses, and email addresses in a single pass.
     """
     
-    # Redact 10-digit phone numbers FIRST (before 7-digit)
-    text = re.sub(r'\d{3}-\d{3}-\d{4}', '[REDACTED]', text)
-    
-    # Then redact 7-digit phone numbers
-    text = re.sub(r'\d{3}-\d{4}', '[REDACTED]', text)
-    
-    # Redact IP addresses
-    text = re.sub(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', '[IP_REDACTED]', text)
-    
-    # Redact email addresses
-    text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[EMAIL_REDACTED]', text)
+    # Every pattern needs a '-' (phones) or a '.' (IPs, email domains)
+    if '-' not in text and '.' not in text:
+        return text
     
-    return text
\ No newline at end of file
+    return PII_PATTERN.sub(lambda match: PII_REPLACEMENTS[match.lastgroup], text)
\ No newline at end of file
@@ -66,7 +66,8 @@ resource "aws_iam_role_policy" "worker_permissions" {
         Action = [
           "dynamodb:PutItem",
           "dynamodb:GetItem",
-          "dynamodb:Query"
+          "dynamodb:Query",
+          "dynamodb:DescribeTable"
         ]
         Resource = [
           aws_dynamodb_table.logs.arn,
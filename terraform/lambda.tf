@@ -48,7 +48,8 @@ resource "aws_lambda_function" "worker" {
 
   environment {
     variables = {
-      DYNAMODB_TABLE = aws_dynamodb_table.logs.name
+      DYNAMODB_TABLE      = aws_dynamodb_table.logs.name
+      SIMULATE_PROCESSING = tostring(var.simulate_processing)
     }
   }
 
@@ -70,6 +71,9 @@ resource "aws_lambda_event_source_mapping" "sqs_trigger" {
   # Wait up to 5 seconds to collect more messages before triggering
   maximum_batching_window_in_seconds = 5
 
+  # Only the messages listed in the worker's batchItemFailures are retried
+  function_response_types = ["ReportBatchItemFailures"]
+
   # Allow up to 100 concurrent Lambda invocations
   scaling_config {
     maximum_concurrency = 100
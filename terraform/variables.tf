@@ -14,4 +14,10 @@ variable "environment" {
   description = "Deployment environment"
   type        = string
   default     = "prod"
+}
+
+variable "simulate_processing" {
+  description = "Run the worker's 0.05s-per-character processing delay (billed Lambda time)"
+  type        = bool
+  default     = true
 }
\ No newline at end of file
@@ -4,9 +4,65 @@ Shared pytest fixtures and configuration.
 This file contains fixtures that are shared across multiple test modules.
 """
 
+import importlib.util
+import json
 import pytest
 import os
-from unittest.mock import patch, MagicMock
+import socket
+from unittest.mock import patch
+
+import boto3
+
+
+@pytest.fixture(scope='session', autouse=True)
+def block_network():
+    """
+    Fail any test that opens a real network connection.
+    AWS clients are always mocked, so a connection attempt means a test
+    bypassed its mock and would otherwise hit real AWS.
+    """
+    def guard(*args, **kwargs):
+        raise RuntimeError('Network access is disabled in unit tests')
+    
+    with patch.object(socket, 'getaddrinfo', guard), \
+            patch.object(socket.socket, 'connect', guard), \
+            patch.object(socket.socket, 'connect_ex', guard):
+        yield
+
+
+# Event skeletons built once; fixtures shallow-copy them and fill in per-call
+# fields, so nested dicts (attributes, identity) are shared and must not be mutated
+SQS_RECORD_TEMPLATE = {
+    'attributes': {
+        'ApproximateReceiveCount': '1',
+        'SentTimestamp': '1609459200000',
+        'SenderId': 'AIDAI23EXAMPLE',
+        'ApproximateFirstReceiveTimestamp': '1609459200000'
+    },
+    'messageAttributes': {},
+    'md5OfBody': 'abc123',
+    'eventSource': 'aws:sqs',
+    'eventSourceARN': 'arn:aws:sqs:us-east-1:123456789:test-queue',
+    'awsRegion': 'us-east-1'
+}
+
+API_GATEWAY_EVENT_TEMPLATE = {
+    'isBase64Encoded': False
+}
+
+REQUEST_CONTEXT_TEMPLATE = {
+    'accountId': '123456789012',
+    'apiId': 'api123',
+    'protocol': 'HTTP/1.1',
+    'stage': 'test',
+    'requestId': 'test-request-id',
+    'requestTime': '01/Jan/2024:00:00:00 +0000',
+    'requestTimeEpoch': 1609459200000,
+    'identity': {
+        'sourceIp': '127.0.0.1',
+        'userAgent': 'test-agent'
+    }
+}
 
 
 @pytest.fixture
@@ -23,28 +79,16 @@ def sample_sqs_event():
         Returns:
             Dict representing an SQS Lambda event
         """
-        import json
-        
         if not isinstance(messages, list):
             messages = [messages]
         
         return {
             'Records': [
                 {
+                    **SQS_RECORD_TEMPLATE,
                     'messageId': f'msg-{i}',
                     'receiptHandle': f'receipt-{i}',
-                    'body': json.dumps(msg),
-                    'attributes': {
-                        'ApproximateReceiveCount': '1',
-                        'SentTimestamp': '1609459200000',
-                        'SenderId': 'AIDAI23EXAMPLE',
-                        'ApproximateFirstReceiveTimestamp': '1609459200000'
-                    },
-                    'messageAttributes': {},
-                    'md5OfBody': 'abc123',
-                    'eventSource': 'aws:sqs',
-                    'eventSourceARN': 'arn:aws:sqs:us-east-1:123456789:test-queue',
-                    'awsRegion': 'us-east-1'
+                    'body': json.dumps(msg)
                 }
                 for i, msg in enumerate(messages)
             ]
@@ -70,36 +114,48 @@ def sample_api_gateway_event():
         Returns:
             Dict representing an API Gateway Lambda proxy event
         """
-        if headers is None:
-            headers = {}
+        request_context = REQUEST_CONTEXT_TEMPLATE.copy()
+        request_context['httpMethod'] = method
+        request_context['path'] = path
         
-        return {
-            'resource': path,
-            'path': path,
-            'httpMethod': method,
-            'headers': headers,
-            'body': body,
-            'isBase64Encoded': False,
-            'requestContext': {
-                'accountId': '123456789012',
-                'apiId': 'api123',
-                'protocol': 'HTTP/1.1',
-                'httpMethod': method,
-                'path': path,
-                'stage': 'test',
-                'requestId': 'test-request-id',
-                'requestTime': '01/Jan/2024:00:00:00 +0000',
-                'requestTimeEpoch': 1609459200000,
-                'identity': {
-                    'sourceIp': '127.0.0.1',
-                    'userAgent': 'test-agent'
-                }
-            }
-        }
+        event = API_GATEWAY_EVENT_TEMPLATE.copy()
+        event['resource'] = path
+        event['path'] = path
+        event['httpMethod'] = method
+        event['headers'] = headers if headers is not None else {}
+        event['body'] = body
+        event['requestContext'] = request_context
+        
+        return event
     
     return _create_event
 
 
+@pytest.fixture
+def import_fresh_handler():
+    """
+    Execute a handler module again as a separate copy, so its import-time
+    warm-up runs against mock_client without replacing the shared lambda_function.
+    handler is the directory under lambda/ (e.g. 'worker'); env_value=None runs
+    the import with env_var unset.
+    """
+    def _import(handler, env_var, env_value, mock_client):
+        path = os.path.join(os.path.dirname(__file__), '..', 'lambda', handler, 'lambda_function.py')
+        spec = importlib.util.spec_from_file_location(f'{handler}_warm_up_copy', path)
+        module = importlib.util.module_from_spec(spec)
+        with patch.dict(os.environ), patch.object(boto3, 'client', return_value=mock_client):
+            os.environ.pop(env_var, None)
+            if env_value is not None:
+                os.environ[env_var] = env_value
+            spec.loader.exec_module(module)
+        # A worker copy starts its own (idle) thread pool; don't leave it behind
+        if hasattr(module, 'executor'):
+            module.executor.shutdown()
+        return module
+    
+    return _import
+
+
 @pytest.fixture
 def mock_aws_credentials():
     """